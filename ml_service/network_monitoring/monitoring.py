@@ -1,11 +1,18 @@
 import os
+import threading
+import warnings
 import joblib
+from joblib import parallel_backend
+import numpy as np
 from scapy.all import sniff
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import LabelEncoder
-import pandas as pd
 from packet_processor import PacketProcessor
 
+# The model was fitted on a DataFrame, so ndarray predicts trigger the
+# "X does not have valid feature names" warning on every packet
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
 # ----------------------
 # Configurable Variables
 # ----------------------
@@ -13,6 +20,8 @@ CSV_LOG_FILE = "network_log.csv"
 MODEL_FILE = "isolation_forest_model.pkl"
 ENCODER_FILE = "label_encoders.pkl"
 FILTER = "ip or arp"
+BATCH_SIZE = 256
+FLUSH_INTERVAL = 2.0  # seconds; bounds prediction latency under low traffic
 
 # ----------------------
 # Load Model and Encoders
@@ -25,70 +34,101 @@ else:
     print("❌ Isolation Forest model or encoders not found. Please train them first.")
     exit(1)
 
+# Plain dict lookups replace LabelEncoder.transform, which pays for a
+# searchsorted plus array boxing (and a raised exception for unseen
+# values) on every single packet
+src_ip_map = {label: idx for idx, label in enumerate(encoders["src_ip"].classes_)}
+dst_ip_map = {label: idx for idx, label in enumerate(encoders["dst_ip"].classes_)}
+protocol_map = {label: idx for idx, label in enumerate(encoders["protocol"].classes_)}
+
 # Initialize packet processor
 processor = PacketProcessor(CSV_LOG_FILE)
 
-def preprocess_packet_data(packet_data):
-    """Preprocess packet data for anomaly detection."""
-    try:
-        src_encoded = encoders["src_ip"].transform([packet_data['source_ip']])[0]
-    except:
-        src_encoded = -1
-    try:
-        dst_encoded = encoders["dst_ip"].transform([packet_data['destination_ip']])[0]
-    except:
-        dst_encoded = -1
-    try:
-        proto_encoded = encoders["protocol"].transform([packet_data['protocol']])[0]
-    except:
-        proto_encoded = -1
+# Batch buffer: a one-row predict spends nearly all of its time in
+# sklearn call overhead, so packets are staged here and scored in
+# batches of BATCH_SIZE (or after FLUSH_INTERVAL, whichever comes first)
+_batch_features = np.empty((BATCH_SIZE, 4), dtype=np.float32)
+_batch_rows = []  # (timestamp, src_ip, dst_ip, protocol, length, note)
+_batch_lock = threading.Lock()
+_flush_timer = None
+
+def _flush_batch():
+    """Predict and log everything staged in the batch buffer."""
+    global _flush_timer
+    with _batch_lock:
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+        count = len(_batch_rows)
+        if count == 0:
+            return
+        features = _batch_features[:count].copy()
+        rows = _batch_rows[:]
+        del _batch_rows[:]
 
-    return pd.DataFrame([{
-        "Source IP": src_encoded,
-        "Destination IP": dst_encoded,
-        "Protocol": proto_encoded,
-        "Length": packet_data['length']
-    }])
+    # n_jobs on the estimator only parallelizes fit; predict-time tree
+    # evaluation needs an explicit joblib backend
+    with parallel_backend('threading', n_jobs=os.cpu_count()):
+        predictions = iso_forest.predict(features)
+    for (timestamp, src_ip, dst_ip, protocol, length, note), prediction in zip(rows, predictions):
+        anomaly_note = "Anomaly Detected" if prediction == -1 else ""
+        processor.log_to_csv(timestamp, src_ip, dst_ip, protocol, length,
+                             anomaly_note or note or "")
+        if anomaly_note:
+            print(f"[{timestamp}] {src_ip} → {dst_ip} | {protocol} | {length} bytes ⚠️ Anomaly")
+        else:
+            print(f"[{timestamp}] {src_ip} → {dst_ip} | {protocol} | {length} bytes")
 
 def process_packet(packet):
-    """Process a packet and detect anomalies."""
+    """Process a packet and stage it for batched anomaly detection."""
+    global _flush_timer
+
     # Process packet using unified processor
     packet_data, note = processor.process_packet(packet)
-    
+
     if packet_data is None:
         return
 
-    # Log the packet
-    processor.log_to_csv(
-        packet_data['timestamp'],
-        packet_data['source_ip'],
-        packet_data['destination_ip'],
-        packet_data['protocol'],
-        packet_data['length'],
-        note or ""
-    )
+    # ARP packets skip anomaly detection and log immediately
+    if packet_data['protocol'] == 'ARP':
+        processor.log_to_csv(
+            packet_data['timestamp'],
+            packet_data['source_ip'],
+            packet_data['destination_ip'],
+            packet_data['protocol'],
+            packet_data['length'],
+            note or ""
+        )
+        return
 
-    # Detect anomalies for IP packets
-    if packet_data['protocol'] != 'ARP':
-        features_df = preprocess_packet_data(packet_data)
-        prediction = iso_forest.predict(features_df)
-        anomaly_note = "Anomaly Detected" if prediction[0] == -1 else ""
-        
-        if anomaly_note:
-            processor.log_to_csv(
-                packet_data['timestamp'],
-                packet_data['source_ip'],
-                packet_data['destination_ip'],
-                packet_data['protocol'],
-                packet_data['length'],
-                anomaly_note
-            )
-            print(f"[{packet_data['timestamp']}] {packet_data['source_ip']} → {packet_data['destination_ip']} | {packet_data['protocol']} | {packet_data['length']} bytes ⚠️ Anomaly")
-        else:
-            print(f"[{packet_data['timestamp']}] {packet_data['source_ip']} → {packet_data['destination_ip']} | {packet_data['protocol']} | {packet_data['length']} bytes")
+    with _batch_lock:
+        idx = len(_batch_rows)
+        _batch_features[idx, 0] = src_ip_map.get(packet_data['source_ip'], -1)
+        _batch_features[idx, 1] = dst_ip_map.get(packet_data['destination_ip'], -1)
+        _batch_features[idx, 2] = protocol_map.get(packet_data['protocol'], -1)
+        _batch_features[idx, 3] = packet_data['length']
+        _batch_rows.append((
+            packet_data['timestamp'],
+            packet_data['source_ip'],
+            packet_data['destination_ip'],
+            packet_data['protocol'],
+            packet_data['length'],
+            note
+        ))
+        full = idx + 1 == BATCH_SIZE
+        if not full and _flush_timer is None:
+            _flush_timer = threading.Timer(FLUSH_INTERVAL, _flush_batch)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+    if full:
+        _flush_batch()
 
 # ----------------------
 # Start Sniffing
 # ----------------------
 print(f"🟢 Starting live capture with anomaly detection... Logging to {CSV_LOG_FILE}")
-sniff(filter=FILTER, prn=process_packet, store=False) 
\ No newline at end of file
+try:
+    sniff(filter=FILTER, prn=process_packet, store=False)
+finally:
+    _flush_batch()
\ No newline at end of file
@@ -1,6 +1,8 @@
+import atexit
 import csv
 import os
-from datetime import datetime
+import threading
+import time
 from scapy.all import IP, TCP, UDP, ARP
 from typing import Dict, Any, Optional, Tuple
 
@@ -9,6 +11,17 @@ class PacketProcessor:
         self.csv_log_file = csv_log_file
         self.known_macs = set()
         self._setup_logging()
+        # One persistent append handle with a 64 KB buffer; opening and
+        # closing the file per packet made every log an open/close
+        # syscall pair plus an unbuffered write
+        self._log_file = open(self.csv_log_file, mode='a', newline='', buffering=1 << 16)
+        self._log_writer = csv.writer(self._log_file)
+        self._log_lock = threading.Lock()
+        atexit.register(self.close)
+        # Timestamps have 1 s resolution, so the formatted string is
+        # cached and only rebuilt when the second rolls over
+        self._last_second = 0
+        self._last_timestamp = ''
 
     def _setup_logging(self):
         """Initialize CSV logging if file doesn't exist."""
@@ -19,22 +32,35 @@ class PacketProcessor:
 
     def log_to_csv(self, timestamp: str, src_ip: str, dst_ip: str, protocol: str, length: int, note: str = ""):
         """Log packet information to CSV file."""
-        with open(self.csv_log_file, mode='a', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow([timestamp, src_ip, dst_ip, protocol, length, note])
+        with self._log_lock:
+            self._log_writer.writerow([timestamp, src_ip, dst_ip, protocol, length, note])
+
+    def close(self):
+        """Flush buffered rows and close the log file."""
+        with self._log_lock:
+            if not self._log_file.closed:
+                self._log_file.flush()
+                self._log_file.close()
 
     def process_packet(self, packet: Any) -> Tuple[Dict[str, Any], Optional[str]]:
         """
         Process a network packet and return its data and any notes.
         Returns a tuple of (packet_data, note)
         """
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        second = int(time.time())
+        if second != self._last_second:
+            self._last_second = second
+            self._last_timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(second))
+        timestamp = self._last_timestamp
         note = None
 
+        # Each haslayer/packet[X] pair walks the layer chain again, so
+        # every layer is resolved once with getlayer and reused
         # Handle ARP packets
-        if packet.haslayer(ARP) and packet[ARP].op == 1:
-            mac = packet[ARP].hwsrc
-            ip = packet[ARP].psrc
+        arp = packet.getlayer(ARP)
+        if arp is not None and arp.op == 1:
+            mac = arp.hwsrc
+            ip = arp.psrc
             if mac not in self.known_macs:
                 self.known_macs.add(mac)
                 note = f"New device detected - MAC: {mac}"
@@ -50,30 +76,34 @@ class PacketProcessor:
             return None, None
 
         # Handle IP packets
-        if packet.haslayer(IP):
-            src_ip = packet[IP].src
-            dst_ip = packet[IP].dst
+        ip_layer = packet.getlayer(IP)
+        if ip_layer is not None:
+            src_ip = ip_layer.src
+            dst_ip = ip_layer.dst
             length = len(packet)
-            
+
             # Determine protocol
-            if packet.haslayer(TCP):
+            tcp = packet.getlayer(TCP)
+            if tcp is not None:
                 protocol = 'TCP'
                 details = {
                     'protocol': 'TCP',
-                    'source_port': packet[TCP].sport,
-                    'destination_port': packet[TCP].dport,
-                    'flags': packet[TCP].flags
-                }
-            elif packet.haslayer(UDP):
-                protocol = 'UDP'
-                details = {
-                    'protocol': 'UDP',
-                    'source_port': packet[UDP].sport,
-                    'destination_port': packet[UDP].dport
+                    'source_port': tcp.sport,
+                    'destination_port': tcp.dport,
+                    'flags': tcp.flags
                 }
             else:
-                protocol = 'Other'
-                details = {'protocol': 'Other'}
+                udp = packet.getlayer(UDP)
+                if udp is not None:
+                    protocol = 'UDP'
+                    details = {
+                        'protocol': 'UDP',
+                        'source_port': udp.sport,
+                        'destination_port': udp.dport
+                    }
+                else:
+                    protocol = 'Other'
+                    details = {'protocol': 'Other'}
 
             packet_data = {
                 'timestamp': timestamp,
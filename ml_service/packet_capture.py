@@ -1,28 +1,66 @@
-from scapy.all import sniff, IP, TCP, UDP, ICMP, conf
+from scapy.all import sniff, conf
 import socketio
 import sys
 import os
 import ctypes
 import logging
+import functools
+import re
+import socket
+import struct
 from datetime import datetime
 import time
 from flask import Flask, request
 from flask_socketio import SocketIO
 import threading
+import collections
 
 # Configure logging
 logging.basicConfig(
-    level=logging.DEBUG,  # Changed to DEBUG for more detailed logs
+    level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
+# Checked once at import: the per-packet debug f-strings format their
+# arguments even when DEBUG is filtered, which is pure waste at line rate
+_DEBUG = logger.isEnabledFor(logging.DEBUG)
+
+# Prefer eventlet's non-blocking IO for Socket.IO; the threading mode
+# serializes every emit through the GIL alongside the sniff thread
+try:
+    import eventlet  # noqa: F401
+    ASYNC_MODE = 'eventlet'
+except ImportError:
+    ASYNC_MODE = 'threading'
+
+# Serialize emits with orjson when available; stdlib json dominates the
+# emit thread once the capture path itself is cheap
+try:
+    import orjson
+
+    class _OrjsonModule:
+        """Minimal json-module shim backed by orjson for python-socketio."""
+
+        @staticmethod
+        def dumps(obj, **kwargs):
+            return orjson.dumps(obj).decode()
+
+        @staticmethod
+        def loads(s, **kwargs):
+            return orjson.loads(s)
+
+    _JSON_MODULE = _OrjsonModule
+except ImportError:
+    _JSON_MODULE = None
+
 # Initialize Flask and SocketIO
 app = Flask(__name__)
 socketio = SocketIO(
     app,
     cors_allowed_origins="*",
-    async_mode='threading',
+    async_mode=ASYNC_MODE,
+    json=_JSON_MODULE,
     ping_timeout=60,
     ping_interval=25,
     max_http_buffer_size=1e8
@@ -32,6 +70,33 @@ socketio = SocketIO(
 capture_thread = None
 stop_capture = False
 
+# Kernel-side BPF filter: non-IP frames are dropped by libpcap before
+# they ever reach Python
+CAPTURE_FILTER = "ip and (tcp or udp or icmp)"
+
+# Captured packets are buffered and flushed in batches; emitting one
+# Socket.IO frame per packet cannot keep up on a busy link. The buffer
+# is bounded so a slow client drops the oldest packets instead of
+# growing without limit or blocking libpcap
+EMIT_BATCH_SIZE = 64
+EMIT_INTERVAL = 0.1  # seconds
+PACKET_BUFFER_MAX = 10000
+packet_buffer = collections.deque(maxlen=PACKET_BUFFER_MAX)
+buffer_lock = threading.Lock()
+emitter_task = None
+dropped_packets = 0
+
+# Callback errors are rate-limited to one log line per second; a parse
+# error that hits every packet would otherwise pin a core formatting
+# log records
+_err_count = 0
+_last_err_log = 0.0
+
+# Header constants for parsing frames straight from the raw bytes
+_ETH_IPV4 = 0x0800
+_ETH_HDR_LEN = 14
+_PORTS_UNPACK = struct.Struct('!HH').unpack_from
+
 def is_admin():
     """Check if the script is running with administrator privileges."""
     try:
@@ -57,64 +122,132 @@ def check_winpcap():
         logger.error(f"Error checking WinPcap: {str(e)}")
         return False
 
-def get_tcp_flags(flags):
-    """Convert TCP flags to a string representation."""
-    flag_names = []
-    if flags & 0x01:  # FIN
-        flag_names.append('FIN')
-    if flags & 0x02:  # SYN
-        flag_names.append('SYN')
-    if flags & 0x04:  # RST
-        flag_names.append('RST')
-    if flags & 0x08:  # PSH
-        flag_names.append('PSH')
-    if flags & 0x10:  # ACK
-        flag_names.append('ACK')
-    if flags & 0x20:  # URG
-        flag_names.append('URG')
-    return ' '.join(flag_names) if flag_names else 'None'
+# TCP flag strings precomputed for all 64 FIN/SYN/RST/PSH/ACK/URG
+# combinations, so decoding on the sniff hot path is a single table fetch
+# instead of six branches and list appends per packet
+_FLAG_NAMES = ('FIN', 'SYN', 'RST', 'PSH', 'ACK', 'URG')
+FLAG_TABLE = tuple(
+    ' '.join(name for bit, name in enumerate(_FLAG_NAMES) if flags & (1 << bit)) or 'None'
+    for flags in range(64)
+)
+
+def _fill_tcp(raw, l4_off):
+    """Extract (source_port, destination_port, flags) from a TCP header."""
+    sport, dport = _PORTS_UNPACK(raw, l4_off)
+    return sport, dport, FLAG_TABLE[raw[l4_off + 13] & 0x3f]
+
+def _fill_udp(raw, l4_off):
+    """Extract (source_port, destination_port, flags) from a UDP header."""
+    sport, dport = _PORTS_UNPACK(raw, l4_off)
+    return sport, dport, None
+
+# IP protocol number -> layer-4 field extractor; a single dict fetch
+# replaces the per-packet protocol if/elif chain
+_PROTO_HANDLERS = {6: _fill_tcp, 17: _fill_udp}
+
+# Interface classifiers, compiled once; one regex scan per description
+# replaces a pile of lowercase-and-substring tests
+_WIFI_RE = re.compile(r'wireless|wi-?fi|wlan|802\.11', re.I)
+_ETH_RE = re.compile(r'ethernet|local area', re.I)
+_LOOP_RE = re.compile(r'loop|127\.0\.0\.1', re.I)
+
+@functools.lru_cache(maxsize=1)
+def _select_interface():
+    """Pick the best capture interface in one ranked pass.
+
+    Preference order is wireless, then ethernet, then any non-loopback
+    interface. Cached because enumeration hits the Windows registry / IP
+    Helper API and the interface list rarely changes; invalidated via the
+    refresh_interfaces socket event.
+    """
+    wifi = ethernet = other = None
+    for iface in conf.ifaces.data.values():
+        description = getattr(iface, 'description', '') or ''
+        name = getattr(iface, 'name', '') or ''
+        if _LOOP_RE.search(description) or _LOOP_RE.search(name):
+            continue
+        if wifi is None and _WIFI_RE.search(description):
+            wifi = iface.name
+        elif ethernet is None and _ETH_RE.search(description):
+            ethernet = iface.name
+        elif other is None:
+            other = iface.name
+    selected = wifi or ethernet or other
+    if selected:
+        logger.info(f"Selected capture interface: {selected}")
+    return selected
 
 def packet_callback(packet):
     """Process captured packets and emit them to connected clients."""
+    global dropped_packets, _err_count, _last_err_log
     try:
-        if IP in packet:
-            logger.debug(f"Processing packet: {packet[IP].src} -> {packet[IP].dst}")
-            packet_data = {
-                'timestamp': int(time.time()),
-                'source_ip': packet[IP].src,
-                'destination_ip': packet[IP].dst,
-                'protocol': packet[IP].proto,
-                'length': len(packet),
-                'details': {
-                    'protocol': packet[IP].proto
-                }
-            }
-
-            # Add protocol-specific details
-            if TCP in packet:
-                packet_data['details'].update({
-                    'protocol': 'TCP',
-                    'source_port': packet[TCP].sport,
-                    'destination_port': packet[TCP].dport,
-                    'flags': get_tcp_flags(packet[TCP].flags)
-                })
-            elif UDP in packet:
-                packet_data['details'].update({
-                    'protocol': 'UDP',
-                    'source_port': packet[UDP].sport,
-                    'destination_port': packet[UDP].dport
-                })
-            elif ICMP in packet:
-                packet_data['details'].update({
-                    'protocol': 'ICMP',
-                    'type': packet[ICMP].type,
-                    'code': packet[ICMP].code
-                })
-
-            logger.debug(f"Emitting packet: {packet_data}")
-            socketio.emit('packet', packet_data)
+        # Unpack the fixed IPv4/TCP/UDP header fields straight from the
+        # captured bytes; Scapy's layer indexing re-runs its pure-Python
+        # dissector on every access
+        raw = bytes(packet.original)
+        if len(raw) < _ETH_HDR_LEN + 20 or (raw[12] << 8) | raw[13] != _ETH_IPV4:
+            return
+
+        ihl = (raw[_ETH_HDR_LEN] & 0x0f) * 4
+        proto = raw[_ETH_HDR_LEN + 9]
+        src_ip = socket.inet_ntoa(raw[_ETH_HDR_LEN + 12:_ETH_HDR_LEN + 16])
+        dst_ip = socket.inet_ntoa(raw[_ETH_HDR_LEN + 16:_ETH_HDR_LEN + 20])
+
+        if _DEBUG:
+            logger.debug(f"Processing packet: {src_ip} -> {dst_ip}")
+
+        # Add protocol-specific details
+        handler = _PROTO_HANDLERS.get(proto)
+        if handler is not None:
+            sport, dport, flags = handler(raw, _ETH_HDR_LEN + ihl)
+        else:
+            sport = dport = flags = None
+
+        # Packets travel as flat tuples rather than nested dicts - at line
+        # rate the dict-per-packet version thrashed the small-object
+        # allocator; the client indexes the positions
+        # packet.time is the capture timestamp libpcap recorded kernel-side,
+        # so no clock syscall is needed per packet
+        packet_data = (
+            int(packet.time), src_ip, dst_ip, proto, len(raw),
+            sport, dport, flags
+        )
+
+        if _DEBUG:
+            logger.debug(f"Buffering packet: {packet_data}")
+        with buffer_lock:
+            if len(packet_buffer) == PACKET_BUFFER_MAX:
+                dropped_packets += 1
+            packet_buffer.append(packet_data)
     except Exception as e:
-        logger.error(f"Error processing packet: {str(e)}", exc_info=True)
+        _err_count += 1
+        now = time.time()
+        if now - _last_err_log > 1.0:
+            logger.error(f"Error processing packets x{_err_count}: {str(e)}")
+            _last_err_log = now
+            _err_count = 0
+
+def emit_packets():
+    """Flush buffered packets to clients in batches."""
+    global dropped_packets
+    last_stats = time.time()
+    while True:
+        while packet_buffer:
+            with buffer_lock:
+                batch = [packet_buffer.popleft()
+                         for _ in range(min(EMIT_BATCH_SIZE, len(packet_buffer)))]
+            socketio.emit('packet_batch', batch)
+
+        # Report overflow drops about once a second
+        now = time.time()
+        if now - last_stats >= 1.0:
+            if dropped_packets:
+                logger.warning(f"Dropped {dropped_packets} packets (slow client)")
+                socketio.emit('capture_stats', {'dropped': dropped_packets})
+                dropped_packets = 0
+            last_stats = now
+
+        socketio.sleep(EMIT_INTERVAL)
 
 @socketio.on('connect')
 def handle_connect():
@@ -127,20 +260,28 @@ def handle_disconnect():
     """Handle client disconnection."""
     logger.info(f"Client disconnected: {request.sid}")
 
+@socketio.on('refresh_interfaces')
+def handle_refresh_interfaces():
+    """Re-enumerate network interfaces on the next capture start."""
+    _select_interface.cache_clear()
+    return {'status': 'success'}
+
 @socketio.on('start_capture')
 def handle_start_capture():
     """Handle start capture request"""
-    global capture_thread, stop_capture
-    
+    global capture_thread, stop_capture, emitter_task
+
     try:
         if not is_admin():
             return {'status': 'error', 'message': 'Administrator privileges required'}
-        
+
         if not check_winpcap():
             return {'status': 'error', 'message': 'WinPcap/Npcap not found'}
-        
+
         if capture_thread is None or not capture_thread.is_alive():
             stop_capture = False
+            if emitter_task is None:
+                emitter_task = socketio.start_background_task(emit_packets)
             capture_thread = threading.Thread(target=start_capture)
             capture_thread.daemon = True
             capture_thread.start()
@@ -170,43 +311,8 @@ def start_capture():
     
     try:
         logger.info("Starting packet capture...")
-        # List all available interfaces
-        interfaces = list(conf.ifaces.data.values())
-        logger.info(f"Available interfaces: {len(interfaces)}")
-        for i, iface in enumerate(interfaces):
-            logger.info(f"Interface {i}: {iface.name} - {iface.description}")
-        
-        # Try to find a suitable interface
-        wifi_interface = None
-        
-        # First try to find a wireless interface
-        for iface in interfaces:
-            description = iface.description.lower() if hasattr(iface, 'description') else ''
-            if any(term in description for term in ['wireless', 'wifi', 'wi-fi', 'wlan', '802.11']):
-                wifi_interface = iface.name
-                logger.info(f"Selected wireless interface: {wifi_interface} - {description}")
-                break
-        
-        # If no wireless interface found, use the first Ethernet interface
-        if not wifi_interface:
-            for iface in interfaces:
-                description = iface.description.lower() if hasattr(iface, 'description') else ''
-                if 'ethernet' in description or 'local area connection' in description:
-                    wifi_interface = iface.name
-                    logger.info(f"Selected ethernet interface: {wifi_interface} - {description}")
-                    break
-        
-        # If still no interface found, use the first available interface (excluding loopback)
-        if not wifi_interface and interfaces:
-            for iface in interfaces:
-                description = iface.description.lower() if hasattr(iface, 'description') else ''
-                name = iface.name.lower() if hasattr(iface, 'name') else ''
-                # Skip loopback interfaces
-                if 'loopback' not in description and 'loop' not in name and '127.0.0.1' not in description:
-                    wifi_interface = iface.name
-                    logger.info(f"Selected first available interface: {wifi_interface} - {description}")
-                    break
-        
+        wifi_interface = _select_interface()
+
         if not wifi_interface:
             logger.error("No suitable network interface found")
             socketio.emit('error', "No suitable network interface found")
@@ -218,6 +324,7 @@ def start_capture():
             # Try to start sniffing with minimal parameters first
             sniff(
                 iface=wifi_interface,
+                filter=CAPTURE_FILTER,
                 prn=packet_callback,
                 store=0,
                 stop_filter=lambda p: stop_capture,
@@ -1,14 +1,20 @@
 import os
 import time
 import json
-import random
 import threading
 import logging
+import numpy as np
 import psutil
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 from flask_socketio import SocketIO
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -27,108 +33,112 @@ devices = [
     {"device": "IoT Devices", "usage": 5, "allocation": 8, "priority": 2},
 ]
 
+# Structure-of-arrays mirror of the device table; the numeric updates run
+# as vector ops and are synced back to the dict list only at emit time.
+# float64 keeps rounded values exact in the emitted JSON — float32 would
+# turn 25.1 into 25.100000381469727 in the payload
+_priority = np.array([d["priority"] for d in devices], dtype=np.float64)
+_usage = np.array([d["usage"] for d in devices], dtype=np.float64)
+_allocation = np.array([d["allocation"] for d in devices], dtype=np.float64)
+
+# One generator shared by all ticks; draws are batched per update
+_rng = np.random.default_rng()
+
+def _sync_devices():
+    """Copy the array values back into the device dict list."""
+    for device, usage, allocation in zip(devices, _usage.tolist(), _allocation.tolist()):
+        device["usage"] = usage
+        device["allocation"] = allocation
+
 # Network monitoring state
 monitoring_thread = None
 stop_monitoring = False
 
+# Counter reads are cached for 100 ms so raising the tick rate (or
+# adding more callers) cannot multiply the underlying syscall rate
+_net_io_cache = {"t": 0.0, "v": None}
+
 def get_system_network_stats():
     """Get real network statistics from the system"""
     try:
-        # Get network I/O stats
-        net_io = psutil.net_io_counters()
-        return {
-            "bytes_sent": net_io.bytes_sent,
-            "bytes_recv": net_io.bytes_recv,
-            "packets_sent": net_io.packets_sent,
-            "packets_recv": net_io.packets_recv,
-            "timestamp": time.time()
-        }
+        # Return psutil's snetio namedtuple directly instead of rewrapping
+        # the fields in a fresh dict every tick; nowrap is stated
+        # explicitly so counter wrap-around handling does not depend on
+        # the installed psutil's default
+        now = time.monotonic()
+        if _net_io_cache["v"] is None or now - _net_io_cache["t"] > 0.1:
+            _net_io_cache["v"] = psutil.net_io_counters(nowrap=True)
+            _net_io_cache["t"] = now
+        return _net_io_cache["v"]
     except Exception as e:
         logger.error(f"Error getting network stats: {e}")
         return None
 
-def update_device_usage():
-    """Update device usage based on real system data and some randomization"""
-    # Get real network activity
-    net_stats = get_system_network_stats()
-    if not net_stats:
-        return
-    
-    # Calculate total network traffic
-    total_traffic = net_stats["bytes_sent"] + net_stats["bytes_recv"]
-    
-    # Distribute traffic among devices with some randomization
-    total_priority = sum(device["priority"] for device in devices)
-    
-    # Update each device's usage
-    for device in devices:
-        # Base usage on priority and add some randomness
-        priority_factor = device["priority"] / total_priority
-        randomness = random.uniform(0.8, 1.2)  # +/- 20%
-        
-        # Calculate new usage (0-100%)
-        new_usage = min(100, max(5, 
-            device["usage"] * 0.6 +  # 60% of previous usage for stability
-            40 * priority_factor * randomness  # 40% new value based on priority and randomness
-        ))
-        
-        device["usage"] = round(new_usage, 1)
+def update_device_usage(rate_bps=0.0):
+    """Update device usage from the measured network rate plus randomization"""
+    # Scale the fresh component by actual load: ~10 MB/s maps to full
+    # weight, so idle links drift down and busy links push usage up.
+    # Without a measurement the neutral factor reproduces the old drift.
+    load_factor = min(rate_bps / 1e7, 1.0) if rate_bps > 0 else 0.5
 
-def knapsack_optimize_bandwidth():
-    """Optimize bandwidth allocation using Knapsack algorithm"""
-    # Total bandwidth capacity (100 units)
-    total_capacity = 100
-    
-    # Make a copy of devices to work with
-    working_devices = devices.copy()
-    
-    # Sort devices by priority (higher priority first)
-    working_devices.sort(key=lambda x: x["priority"], reverse=True)
-    
-    # Calculate total priority value for weighted allocation
-    total_priority = sum(device["priority"] for device in working_devices)
-    
-    # Track remaining capacity
-    remaining_capacity = total_capacity
-    
-    # Allocate bandwidth optimally
-    for device in working_devices:
+    # One vectorized expression replaces the per-device Python loop:
+    # 60% of the previous usage for stability plus a load- and
+    # priority-weighted share with +/- 20% noise, clipped to 5-100%
+    priority_factor = _priority / _priority.sum()
+    randomness = _rng.uniform(0.8, 1.2, size=len(devices))
+    np.clip(0.6 * _usage + 80 * load_factor * priority_factor * randomness,
+            5, 100, out=_usage)
+    np.round(_usage, 1, out=_usage)
+
+    _sync_devices()
+
+def _knapsack_kernel(priority, usage, capacity):
+    """Greedy allocation by descending priority over the device arrays."""
+    allocation = np.empty_like(usage)
+    order = np.argsort(-priority)
+    total_priority = priority.sum()
+    remaining = capacity
+
+    for i in order:
         # Calculate weight based on priority and usage
-        weight = (device["priority"] / total_priority * 2) + (device["usage"] / 100)
-        
+        weight = (priority[i] / total_priority * 2) + (usage[i] / 100)
+
         # Calculate allocation (prioritize higher-priority devices)
-        allocation = min(
-            round(total_capacity * weight * 0.8),  # Base on weight
-            round(device["usage"] * 1.25),         # Max 25% more than usage
-            remaining_capacity                     # Cannot exceed remaining
+        alloc = min(
+            round(capacity * weight * 0.8),  # Base on weight
+            round(usage[i] * 1.25),          # Max 25% more than usage
+            remaining                        # Cannot exceed remaining
         )
-        
+
         # Ensure minimum allocation based on priority
-        min_allocation = max(device["usage"], device["priority"] * 5)
-        allocation = max(allocation, min(min_allocation, remaining_capacity))
-        
-        # Update device allocation
-        device["allocation"] = round(allocation, 1)
-        
-        # Update remaining capacity
-        remaining_capacity -= allocation
-    
-    # Copy values back to original devices
-    for i, device in enumerate(working_devices):
-        for original_device in devices:
-            if original_device["device"] == device["device"]:
-                original_device["allocation"] = device["allocation"]
-                break
-
-def emit_network_data():
+        min_alloc = max(usage[i], priority[i] * 5)
+        alloc = max(alloc, min(min_alloc, remaining))
+
+        allocation[i] = round(alloc, 1)
+        remaining -= alloc
+
+    return allocation
+
+if NUMBA_AVAILABLE:
+    _knapsack_kernel = njit(cache=True)(_knapsack_kernel)
+    # Warm the JIT at import so no request pays the compile cost
+    _knapsack_kernel(np.ones(1, np.float64), np.ones(1, np.float64), 100.0)
+
+def knapsack_optimize_bandwidth():
+    """Optimize bandwidth allocation using Knapsack algorithm"""
+    # Total bandwidth capacity (100 units)
+    _allocation[:] = _knapsack_kernel(_priority, _usage, 100.0)
+    _sync_devices()
+
+def emit_network_data(rate_bps=0.0):
     """Emit network data to connected clients"""
     # Update usages
-    update_device_usage()
+    update_device_usage(rate_bps)
     
     # Calculate and log bandwidth efficiency
     if devices:
-        total_usage = sum(device["usage"] for device in devices) / len(devices)
-        total_allocation = sum(device["allocation"] for device in devices) / len(devices)
+        total_usage = float(_usage.mean())
+        total_allocation = float(_allocation.mean())
         
         if total_usage > 0:
             efficiency = ((total_allocation - total_usage) / total_usage * 100)
@@ -144,11 +154,31 @@ def monitoring_worker():
     """Background worker to monitor and emit network data"""
     global stop_monitoring
     logger.info("Starting network monitoring")
-    
+
+    prev = get_system_network_stats()
+    prev_time = time.monotonic()
+
     while not stop_monitoring:
-        emit_network_data()
-        time.sleep(2)  # Update every 2 seconds
-    
+        # socketio.sleep yields to the event loop under eventlet/gevent,
+        # where time.sleep would block every connected client
+        socketio.sleep(2)  # Update every 2 seconds
+
+        # Feed the actual transfer rate since the last tick into the
+        # usage model instead of discarding the counters
+        net_io = get_system_network_stats()
+        now = time.monotonic()
+        rate_bps = 0.0
+        if net_io and prev:
+            dt = now - prev_time
+            if dt > 0:
+                rate_bps = ((net_io.bytes_sent + net_io.bytes_recv) -
+                            (prev.bytes_sent + prev.bytes_recv)) / dt
+        if net_io:
+            prev = net_io
+        prev_time = now
+
+        emit_network_data(rate_bps)
+
     logger.info("Network monitoring stopped")
 
 @app.route('/optimize-bandwidth', methods=['POST'])
@@ -26,14 +26,12 @@ def main():
         print(f"Interface {i}: {name}")
         print(f"  - Description: {iface.description if hasattr(iface, 'description') else 'N/A'}")
         print(f"  - Type: {type(iface)}")
-        for attr in dir(iface):
-            if not attr.startswith('_') and attr not in ['__class__', '__dict__', '__weakref__']:
-                try:
-                    value = getattr(iface, attr)
-                    if not callable(value):
-                        print(f"  - {attr}: {value}")
-                except:
-                    pass
+        # vars() returns only real instance attributes, skipping the
+        # descriptor protocol dir()+getattr would run for every inherited
+        # method and property
+        for attr, value in vars(iface).items():
+            if not attr.startswith('_') and not callable(value):
+                print(f"  - {attr}: {value}")
     
     # Check for default interface
     print("\n=== Default Interface ===")
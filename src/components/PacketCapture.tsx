@@ -2,21 +2,19 @@ import React, { useState, useEffect, useCallback } from 'react';
 import { Play, Square, RefreshCw } from 'lucide-react';
 import io from 'socket.io-client';
 
-interface PacketData {
-  timestamp: number;
-  source_ip: string;
-  destination_ip: string;
-  protocol: number;
-  length: number;
-  details: {
-    protocol: string;
-    source_port?: number;
-    destination_port?: number;
-    flags?: string;
-    type?: number;
-    code?: number;
-  };
-}
+// Packets arrive as flat tuples to keep serialization cheap:
+// [timestamp, source_ip, destination_ip, protocol, length,
+//  source_port, destination_port, flags]
+type PacketData = [
+  number,
+  string,
+  string,
+  number,
+  number,
+  number | null,
+  number | null,
+  string | null
+];
 
 const PacketCapture: React.FC = () => {
   const [isCapturing, setIsCapturing] = useState(false);
@@ -43,10 +41,10 @@ const PacketCapture: React.FC = () => {
       setError(null);
     });
 
-    newSocket.on('packet', (packet: PacketData) => {
-      console.log('Received packet:', packet);
+    newSocket.on('packet_batch', (batch: PacketData[]) => {
+      console.log(`Received batch of ${batch.length} packets`);
       setPackets(prev => {
-        const newPackets = [packet, ...prev];
+        const newPackets = [...batch.slice().reverse(), ...prev];
         return newPackets.slice(0, 100); // Keep last 100 packets
       });
       setError(null);
@@ -191,25 +189,25 @@ const PacketCapture: React.FC = () => {
             {packets.map((packet, index) => (
               <tr key={index}>
                 <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-500">
-                  {formatTimestamp(packet.timestamp)}
+                  {formatTimestamp(packet[0])}
                 </td>
                 <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-500">
-                  {packet.source_ip}
+                  {packet[1]}
                 </td>
                 <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-500">
-                  {packet.destination_ip}
+                  {packet[2]}
                 </td>
                 <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-500">
-                  {getProtocolName(packet.protocol)}
+                  {getProtocolName(packet[3])}
                 </td>
                 <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-500">
-                  {packet.length} bytes
+                  {packet[4]} bytes
                 </td>
                 <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-500">
-                  {packet.details.protocol}
-                  {packet.details.source_port && `:${packet.details.source_port}`}
-                  {packet.details.destination_port && ` → ${packet.details.destination_port}`}
-                  {packet.details.flags && ` [${packet.details.flags}]`}
+                  {getProtocolName(packet[3])}
+                  {packet[5] !== null && `:${packet[5]}`}
+                  {packet[6] !== null && ` → ${packet[6]}`}
+                  {packet[7] && ` [${packet[7]}]`}
                 </td>
               </tr>
             ))}
@@ -3,21 +3,28 @@ import { useSocket } from './SocketContext';
 import axios from 'axios';
 import io from 'socket.io-client';
 
-interface PacketData {
-  timestamp: number;
-  source_ip: string;
-  destination_ip: string;
-  protocol: number;
-  length: number;
-  details: {
-    protocol: string;
-    source_port?: number;
-    destination_port?: number;
-    flags?: string;
-    type?: number;
-    code?: number;
-  };
-}
+// Packets arrive as flat tuples to keep serialization cheap:
+// [timestamp, source_ip, destination_ip, protocol, length,
+//  source_port, destination_port, flags]
+type PacketData = [
+  number,
+  string,
+  string,
+  number,
+  number,
+  number | null,
+  number | null,
+  string | null
+];
+
+const PROTOCOL_NAMES: { [key: number]: string } = {
+  1: 'ICMP',
+  6: 'TCP',
+  17: 'UDP'
+};
+
+const getProtocolName = (protocol: number) =>
+  PROTOCOL_NAMES[protocol] || `Unknown (${protocol})`;
 
 interface AnomalyData {
   id: string;
@@ -137,55 +144,64 @@ export const NetworkDataProvider: React.FC<{ children: React.ReactNode }> = ({ c
   useEffect(() => {
     if (!socket || !isConnected) return;
 
-    // Set up packet listener
-    socket.on('packet', (packet: PacketData) => {
+    // Set up packet listener; the capture service emits batches, not
+    // individual 'packet' events
+    socket.on('packet_batch', (batch: PacketData[]) => {
       try {
         // Update packets
         setPackets(prev => {
-          const newPackets = [packet, ...prev];
+          const newPackets = [...batch.slice().reverse(), ...prev];
           return newPackets.slice(0, 100); // Keep last 100 packets
         });
 
         // Update traffic by protocol
         setTrafficByProtocol(prev => {
-          const protocol = packet.details.protocol;
-          return {
-            ...prev,
-            [protocol]: (prev[protocol] || 0) + packet.length
-          };
+          const updated = { ...prev };
+          for (const packet of batch) {
+            const protocol = getProtocolName(packet[3]);
+            updated[protocol] = (updated[protocol] || 0) + packet[4];
+          }
+          return updated;
         });
 
         // Update traffic by time
         setTrafficByTime(prev => {
-          const timestamp = packet.timestamp;
-          const newTimeData = [...prev, { timestamp, value: packet.length }];
+          const newTimeData = [...prev];
+          for (const packet of batch) {
+            newTimeData.push({ timestamp: packet[0], value: packet[4] });
+          }
           return newTimeData.slice(-30); // Keep last 30 data points
         });
 
         // Check for anomalies (example: large packets or unusual ports)
-        if (packet.length > 1500 || // Large packet
-            (packet.details.protocol === 'TCP' && 
-             (packet.details.destination_port === 22 || // SSH
-              packet.details.destination_port === 3389))) { // RDP
-          const anomaly: AnomalyData = {
-            id: `${packet.timestamp}-${packet.source_ip}`,
-            timestamp: packet.timestamp,
-            source_ip: packet.source_ip,
-            destination_ip: packet.destination_ip,
-            protocol: packet.details.protocol,
-            length: packet.length,
-            confidence: 0.9,
-            type: 'suspicious_traffic',
-            resolved: false
-          };
-          setAnomalies(prev => [...prev, anomaly]);
-          setDetectionCount(prev => prev + 1);
+        const newAnomalies: AnomalyData[] = [];
+        for (const packet of batch) {
+          if (packet[4] > 1500 || // Large packet
+              (packet[3] === 6 && // TCP
+               (packet[6] === 22 || // SSH
+                packet[6] === 3389))) { // RDP
+            newAnomalies.push({
+              id: `${packet[0]}-${packet[1]}`,
+              timestamp: packet[0],
+              source_ip: packet[1],
+              destination_ip: packet[2],
+              protocol: getProtocolName(packet[3]),
+              length: packet[4],
+              confidence: 0.9,
+              type: 'suspicious_traffic',
+              resolved: false
+            });
+          }
+        }
+        if (newAnomalies.length > 0) {
+          setAnomalies(prev => [...prev, ...newAnomalies]);
+          setDetectionCount(prev => prev + newAnomalies.length);
           setThreatLevel('high');
         }
 
         setLastScanTime(new Date());
       } catch (err) {
-        console.error('Error processing packet:', err);
+        console.error('Error processing packet batch:', err);
       }
     });
 
@@ -194,7 +210,7 @@ export const NetworkDataProvider: React.FC<{ children: React.ReactNode }> = ({ c
     });
 
     return () => {
-      socket.off('packet');
+      socket.off('packet_batch');
       socket.off('error');
     };
   }, [socket, isConnected]);